@@ -1,62 +1,38 @@
+import os
+import ctypes
+import hashlib
+import multiprocessing
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State, ClientsideFunction, no_update
 import dash_bootstrap_components as dbc
-import pandas as pd
 import plotly.express as px
-import json
 import dash_leaflet as dl
-import requests
-import bs4
-
-races = pd.read_csv("f1_data/races.csv")
-results = pd.read_csv("f1_data/results.csv")
-drivers = pd.read_csv("f1_data/drivers.csv")
-qualifying = pd.read_csv("f1_data/qualifying.csv")
-circuits = pd.read_csv("f1_data/circuits.csv")
-
-with open("f1_data/mc-1929.geojson") as f:
-    monaco_geojson = json.load(f)
-
-df = results.merge(drivers, on='driverId')
-df = df.merge(races, on='raceId')
-
-df_senna = df[(df['surname'] == 'Senna') & (df['forename'] == 'Ayrton')]
+import build_data
+
+# --- Data Loading ---
+# Use the prebuilt bundle (python build_data.py) when present, else build from the raw sources
+if os.path.exists(os.path.join(build_data.BUNDLE_DIR, build_data.MANIFEST)):
+    data = build_data.load_bundle(build_data.BUNDLE_DIR)
+    data_source = 'bundle'
+else:
+    data = build_data.load_sources()
+    data_source = 'sources'
+
+races = data['races']
+results = data['results']
+drivers = data['drivers']
+qualifying = data['qualifying']
+circuits = data['circuits']
+monaco_geojson = data['monaco_geojson']
+static_figures = data['static_figures']
+
+df_senna = data['df_senna']
 
 senna_wins = df_senna[df_senna['positionOrder'] == 1]
 
 wins_per_season = senna_wins.groupby('year')['positionOrder'].count().reset_index()
 wins_per_season.columns = ['Season', 'Wins']
 
-url = 'https://en.wikipedia.org/wiki/List_of_Formula_One_fatalities'
-req = requests.get(url)
-soup = bs4.BeautifulSoup(req.text, 'html.parser')
-table = soup.find_all('table')[2]
-rows = table.find_all('tr')
-
-headers = [th.get_text(strip=True) for th in rows[0].find_all('th')]
-data = []
-for row in rows[1:]:
-    cells = row.find_all(['td', 'th'])
-    if len(cells) != len(headers):
-        continue
-    row_data = [cell.get_text(strip=True) for cell in cells]
-    data.append(row_data)
-
-df = pd.DataFrame(data, columns=headers)
-df['Date'] = pd.to_datetime(df['Date of accident'], errors='coerce')
-df = df.dropna(subset=['Date'])
-df['Year'] = df['Date'].dt.year.astype(int)
-
-df['Decade'] = (df['Year'] // 10) * 10
-fatalities_per_decade = df.groupby('Decade').size().reset_index(name='Fatalities')
-
-before_1994 = df[df['Year'] < 1994].shape[0]
-after_1994 = df[df['Year'] >= 1994].shape[0]
-pie_data = pd.DataFrame({
-    'Period': ['Before 1994', '1994 and After'],
-    'Fatalities': [before_1994, after_1994]
-})
-
 drivers['driverName'] = drivers['forename'] + ' ' + drivers['surname']
 
 top_drivers = [
@@ -71,6 +47,7 @@ external_stylesheets = [
 ]
 
 app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
+server = app.server
 
 # --- Layout ---
 app.layout = dbc.Container([
@@ -142,6 +119,7 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                     dcc.RangeSlider(
                         id='season-range-slider',
+                        updatemode='drag',
                         min=df_senna['year'].min(),
                         max=df_senna['year'].max(),
                         value=[df_senna['year'].min(), df_senna['year'].max()],
@@ -150,6 +128,7 @@ app.layout = dbc.Container([
                         allowCross=False,
                         tooltip={"placement": "bottom", "always_visible": False}
                     ),
+                    dcc.Store(id='season-range-slider-seq'),
                     dcc.Graph(id='wins-season-bar')])
             ], className="shadow-lg rounded-4 h-100")
         ], width=4),
@@ -161,6 +140,7 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                     dcc.RangeSlider(
                         id='points-season-slider',
+                        updatemode='drag',
                         min=df_senna['year'].min(),
                         max=df_senna['year'].max(),
                         value=[df_senna['year'].min(), df_senna['year'].max()],
@@ -169,6 +149,7 @@ app.layout = dbc.Container([
                         allowCross=False,
                         tooltip={"placement": "bottom", "always_visible": False}
                     ),
+                    dcc.Store(id='points-season-slider-seq'),
                     dcc.Graph(id='points-season-bar')])
             ], className="shadow-lg rounded-4 h-100")
         ], width=4),
@@ -228,6 +209,7 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                         dcc.RangeSlider(
                             id='monaco-year-slider',
+                            updatemode='drag',
                             min=df_senna['year'].min(),
                             max=df_senna['year'].max() - 1,
                             value=[1984, 1993],
@@ -236,6 +218,7 @@ app.layout = dbc.Container([
                             allowCross=False,
                             tooltip={"placement": "bottom", "always_visible": False}
                         ),
+                        dcc.Store(id='monaco-year-slider-seq'),
                         dcc.Graph(id='monaco-finishes')])
             ], className="shadow-lg rounded-4 h-100"),
         ], width=6),
@@ -368,13 +351,65 @@ app.layout = dbc.Container([
     ],fluid=True, className="px-5 py-2")
 
 
+# --- Slider Request Coalescing ---
+# Sliders update while dragging (updatemode='drag'), but assets/clientside.js only passes a value on
+# once the slider has been still for a moment, stamped with a per-tab session id and sequence number
+# so the server can drop requests that a newer change from the same tab has already superseded.
+SEQUENCED_SLIDERS = ['season-range-slider', 'points-season-slider', 'monaco-year-slider']
+SEQ_SLOTS = 8192
+MAX_SEQ = 2 ** 53  # the client's counter is a JS number, exact only below this
+
+for slider_id in SEQUENCED_SLIDERS:
+    app.clientside_callback(
+        ClientsideFunction(namespace='senna', function_name='stampSequence'),
+        Output(f'{slider_id}-seq', 'data'),
+        Input(slider_id, 'value'),
+        State(slider_id, 'id')
+    )
+
+# Latest sequence number per (tab, slider), as (key, seq) pairs in shared memory: serve.py
+# imports the app before forking, so every worker reads and writes the same table
+seq_table = multiprocessing.RawArray(ctypes.c_uint64, 2 * SEQ_SLOTS)
+seq_lock = multiprocessing.Lock()
+
+def _seq_slot(slider_id, stamp):
+    digest = hashlib.blake2b(f"{stamp['session']}:{slider_id}".encode(), digest_size=8).digest()
+    key = int.from_bytes(digest, 'little') or 1
+    return key, 2 * (key % SEQ_SLOTS)
+
+def _valid_stamp(stamp):
+    if not isinstance(stamp, dict) or not isinstance(stamp.get('session'), str):
+        return False
+    seq, value = stamp.get('seq'), stamp.get('value')
+    if type(seq) is not int or not 0 <= seq < MAX_SEQ:
+        return False
+    return (isinstance(value, list) and len(value) == 2
+            and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value))
+
+def is_superseded(slider_id, stamp):
+    # a missing or malformed stamp is dropped like a stale one, before it can touch the table
+    if not _valid_stamp(stamp):
+        return True
+
+    key, slot = _seq_slot(slider_id, stamp)
+    with seq_lock:
+        if seq_table[slot] == key and seq_table[slot + 1] > stamp['seq']:
+            return True
+        # a colliding key just takes the slot over; that tab loses dropping, never correctness
+        seq_table[slot], seq_table[slot + 1] = key, stamp['seq']
+    return False
+
+
 # --- Callbacks / Static Graphs ---
 @app.callback(
     Output('wins-season-bar', 'figure'),
-    Input('season-range-slider', 'value')
+    Input('season-range-slider-seq', 'data')
 )
-def update_wins_season_bar(season_range):
-    start_year, end_year = season_range
+def update_wins_season_bar(stamp):
+    if is_superseded('season-range-slider', stamp):
+        return no_update
+
+    start_year, end_year = stamp['value']
 
     senna_wins = df_senna[
         (df_senna['positionOrder'] == 1) &
@@ -413,10 +448,13 @@ def update_wins_season_bar(season_range):
 
 @app.callback(
     Output('points-season-bar', 'figure'),
-    Input('points-season-slider', 'value')
+    Input('points-season-slider-seq', 'data')
 )
-def update_points_season_bar(season_range):
-    start_year, end_year = season_range
+def update_points_season_bar(stamp):
+    if is_superseded('points-season-slider', stamp):
+        return no_update
+
+    start_year, end_year = stamp['value']
 
     # Filter data based on selected range
     filtered_df = df_senna[(df_senna['year'] >= start_year) & (df_senna['year'] <= end_year)]
@@ -457,128 +495,21 @@ def update_points_season_bar(season_range):
     Input('senna-pie-chart', 'id')
 )
 def update_pie_chart(_):
-    # Categorize finishes
-    finishes = {
-        'Wins': (df_senna['positionOrder'] == 1).sum(),
-        '2nd/3rd (Podiums)': df_senna['positionOrder'].isin([2, 3]).sum(),
-        '4th–10th': df_senna['positionOrder'].between(4, 10).sum(),
-        'Other / DNF': df_senna['positionOrder'].gt(10).sum()
-    }
-
-    pie_df = pd.DataFrame({
-        'Result': list(finishes.keys()),
-        'Count': list(finishes.values())
-    })
-
-    # Generate figure
-    fig = px.pie(
-        pie_df,
-        values='Count',
-        names='Result',
-        hole=0.35,
-        color_discrete_sequence=['#a50026', '#d73027', '#f46d43', '#fdae61'],
-        template='plotly_white',
-    )
-
-    fig.update_traces(
-        textinfo='percent+label',
-        textfont_size=16,
-        marker=dict(line=dict(color='white', width=2)),
-        hovertemplate='%{label}<br>Count: %{value} (%{percent})<extra></extra>'
-    )
-
-    fig.update_layout(
-        showlegend=False,
-        margin=dict(t=20, b=20, l=20, r=20),
-    )
-
-    return fig
+    return static_figures['senna-pie-chart']
 
 @app.callback(
     Output('poles-by-track', 'figure'),
     Input('poles-by-track', 'id')
 )
 def update_poles_by_track(_):
-    poles_by_circuit = (
-        df_senna[df_senna['grid'] == 1]
-        .groupby('name')
-        .size()
-        .reset_index(name='Pole Positions')
-        .sort_values('Pole Positions', ascending=False)
-    )
-
-    poles_by_circuit['name'] = poles_by_circuit['name'].str.replace(r'\s*Grand Prix', '', regex=True)
-
-    # Generate bar chart
-    fig = px.bar(
-        poles_by_circuit,
-        x='name',
-        y='Pole Positions',
-        text='Pole Positions',
-        labels={'name': 'Track'},
-        color_discrete_sequence=['crimson'],
-        template='plotly_white'
-    )
-
-    # Enhance layout
-    fig.update_layout(
-        xaxis_title='Track',
-        yaxis_title='Number of Poles',
-        xaxis_tickfont_size=12,
-        xaxis_tickangle=-45,
-        font=dict(size=14),
-        plot_bgcolor='white',
-        margin=dict(l=20, r=20, t=5, b=40),
-    )
-
-    fig.update_yaxes(tick0=0)
-    fig.update_traces(textposition='outside', hovertemplate='Season: %{x}<br>Points: %{y:.1f}')
-
-    return fig
-
+    return static_figures['poles-by-track']
 
 @app.callback(
     Output('poles-vs-wins', 'figure'),
     Input('poles-vs-wins', 'id')
 )
 def update_poles_vs_wins(_):
-    poles = df_senna[df_senna['grid'] == 1].groupby('year').size().reset_index(name='poles')
-    wins = df_senna[df_senna['positionOrder'] == 1].groupby('year').size().reset_index(name='wins')
-    combined = pd.merge(poles, wins, on='year', how='outer').fillna(0)
-    combined = combined.sort_values('year')
-
-    fig = px.line(
-        combined,
-        x='year',
-        y=['poles', 'wins'],
-        markers=True,
-        labels={'value': 'Count', 'variable': 'Stat', 'year': 'Season'},
-        template='plotly_white',
-        color_discrete_map={'poles': 'crimson', 'wins': 'gold'}
-    )
-
-    fig.update_layout(
-        margin=dict(t=20, b=40, l=20, r=20),
-        legend=dict(title='', font=dict(size=14)),
-        xaxis=dict(
-            rangeslider=dict(visible=True),
-            type='linear',
-            tickmode='linear',
-            dtick=1,
-            title='Season',
-            showgrid=True
-        ),
-        yaxis=dict(
-            title='Count',
-            showgrid=True,
-            zeroline=True
-        )
-    )
-
-    fig.update_traces(marker=dict(size=8))
-
-    return fig
-
+    return static_figures['poles-vs-wins']
 
 @app.callback(
     Output('pole-comparison-graph', 'figure'),
@@ -622,10 +553,13 @@ def update_pole_comparison(selected_drivers):
 
 @app.callback(
     Output('monaco-finishes', 'figure'),
-    Input('monaco-year-slider', 'value')
+    Input('monaco-year-slider-seq', 'data')
 )
-def update_monaco_finishes(season_range):
-    start_year, end_year = season_range
+def update_monaco_finishes(stamp):
+    if is_superseded('monaco-year-slider', stamp):
+        return no_update
+
+    start_year, end_year = stamp['value']
 
     # Filter only Monaco races
     monaco_id = circuits[circuits['name'].str.contains("Monaco", case=False)]['circuitId'].unique()
@@ -669,61 +603,21 @@ def update_monaco_finishes(season_range):
     Input('fatalities-line', 'id')
 )
 def update_fatalities_line(_):
-    fig = px.line(
-        fatalities_per_decade,
-        x='Decade',
-        y='Fatalities',
-        markers=True,
-        labels={'Decade': 'Decade', 'Fatalities': 'Number of Fatalities'},
-        template='plotly_white'
-    )
-
-    fig.update_traces(
-        line=dict(color='crimson', width=3),
-        marker=dict(size=8, symbol='circle'),
-        text=fatalities_per_decade['Fatalities'],
-        textposition="top center",
-        hovertemplate='Decade: %{x}<br>Fatalities: %{y}<extra></extra>'
-    )
-
-    fig.update_layout(
-        font=dict(size=14),
-        margin=dict(l=20, r=20, t=20, b=20),
-        yaxis=dict(tick0=0, dtick=1, title='Number of Fatalities'),
-        xaxis=dict(title='Decade'),
-        plot_bgcolor='white',
-        showlegend=False
-    )
-
-    return fig
-
+    return static_figures['fatalities-line']
 
 @app.callback(
     Output('fatalities-pie', 'figure'),
     Input('fatalities-pie', 'id')
 )
 def update_fatalities_pie(_):
-    pie_fig = px.pie(
-        pie_data,
-        names='Period',
-        values='Fatalities',
-        hole=0.4,
-        color_discrete_sequence=["#1b72dd", '#d73027']
-    )
-
-    pie_fig.update_traces(
-        textinfo='percent+label',
-        hovertemplate='%{label}: %{value} fatalities (%{percent})<extra></extra>'
-    )
-
-    pie_fig.update_layout(
-        margin=dict(t=20, b=20, l=20, r=20),
-        font=dict(size=14),
-        showlegend=True,
-        legend=dict(font=dict(size=16)),
-    )
-
-    return pie_fig
+    return static_figures['fatalities-pie']
+
+# --- Health ---
+# The data and every static figure are loaded at import, however the app is served, and a bad or
+# incomplete bundle fails the import instead, so any process that answers is ready: a liveness check
+@server.route('/healthz')
+def healthz():
+    return {'status': 'ok', 'data': data_source}
 
 if __name__ == '__main__':
     app.run(debug=True)
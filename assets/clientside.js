@@ -0,0 +1,29 @@
+(function() {
+    // How long a slider has to stay still before its value is sent to the server
+    var DEBOUNCE_MS = 250;
+    // One id per tab, so the server can tell which requests supersede each other
+    var SESSION = Math.random().toString(36).slice(2) + Date.now().toString(36);
+    // Latest sequence number handed out per slider
+    var counters = {};
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        senna: {
+            // Debounce a slider (updatemode='drag') and stamp the value that settles with
+            // this tab's session id and the next sequence number
+            stampSequence: function(value, sliderId) {
+                var initial = !(sliderId in counters);
+                var seq = counters[sliderId] = (counters[sliderId] || 0) + 1;
+                var stamp = {session: SESSION, seq: seq, value: value};
+                if (initial) {
+                    return stamp;
+                }
+                return new Promise(function(resolve) {
+                    setTimeout(function() {
+                        // a newer value arrived while waiting: drop this one
+                        resolve(counters[sliderId] === seq ? stamp : window.dash_clientside.no_update);
+                    }, DEBOUNCE_MS);
+                });
+            }
+        }
+    });
+})();
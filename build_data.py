@@ -0,0 +1,456 @@
+"""Build the prebuilt data bundle used by the dashboard.
+
+Ingests the Kaggle CSVs, the f1-circuits GeoJSON and the Wikipedia
+fatalities table from local files, archives (.zip) or mirror directories,
+validates and dedupes them, and writes typed caches plus the derived
+aggregates and static figures (see figures.py) into a single checksummed
+bundle directory.
+
+    python build_data.py --source f1_data --out f1_data/bundle
+    python build_data.py --source kaggle-f1.zip --geojson f1-circuits-master.zip \
+        --fatalities-html fatalities.html --offline
+
+Re-running resumes: steps whose inputs and outputs still match the manifest
+are skipped, so an interrupted build only redoes what is missing.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import plotly
+
+import figures
+
+FATALITIES_URL = 'https://en.wikipedia.org/wiki/List_of_Formula_One_fatalities'
+MONACO_GEOJSON = 'mc-1929.geojson'
+BUNDLE_DIR = 'f1_data/bundle'
+MANIFEST = 'manifest.json'
+BUNDLE_VERSION = 2
+
+# Kaggle tables: required columns, primary key used for dedupe, minimum row count
+TABLES = {
+    'races': {
+        'columns': ['raceId', 'year', 'round', 'circuitId', 'name', 'date'],
+        'key': ['raceId'],
+        'min_rows': 1000,
+    },
+    'results': {
+        'columns': ['resultId', 'raceId', 'driverId', 'grid', 'positionOrder', 'points'],
+        'key': ['resultId'],
+        'min_rows': 20000,
+    },
+    'drivers': {
+        'columns': ['driverId', 'forename', 'surname'],
+        'key': ['driverId'],
+        'min_rows': 800,
+    },
+    'qualifying': {
+        'columns': ['qualifyId', 'raceId', 'driverId', 'position'],
+        'key': ['qualifyId'],
+        'min_rows': 5000,
+    },
+    'circuits': {
+        'columns': ['circuitId', 'name'],
+        'key': ['circuitId'],
+        'min_rows': 70,
+    },
+}
+
+FATALITIES_MIN_ROWS = 30
+
+# Everything app.py reads from a bundle
+ARTIFACTS = [*TABLES, 'monaco_geojson', 'fatalities', 'df_senna', 'fatalities_per_decade', 'pie_data',
+             'static_figures']
+
+
+class BuildError(Exception):
+    pass
+
+
+# --- Source access ---
+def find_source(source, filename):
+    """Locate `filename` in a directory tree or zip archive.
+
+    Returns (label, bytes). Mirrors and archives may nest files in
+    subfolders (e.g. f1-circuits-master/circuits/), so match on basename.
+    """
+    try:
+        if os.path.isfile(source) and zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as zf:
+                for member in zf.namelist():
+                    if os.path.basename(member) == filename:
+                        return f'{source}:{member}', zf.read(member)
+        elif os.path.isfile(source) and os.path.basename(source) == filename:
+            with open(source, 'rb') as f:
+                return source, f.read()
+        elif os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                if filename in files:
+                    path = os.path.join(root, filename)
+                    with open(path, 'rb') as f:
+                        return path, f.read()
+    except (OSError, zipfile.BadZipFile) as e:
+        raise BuildError(f'{source}: cannot read {filename}: {e}') from e
+    raise BuildError(f'{filename} not found in {source}')
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# --- Transforms (shared with app.py) ---
+def read_table(name, raw, label=None):
+    """Parse a Kaggle CSV, validate its schema and row count, and dedupe it."""
+    spec = TABLES[name]
+    try:
+        table = pd.read_csv(io.BytesIO(raw), na_values=['\\N'])
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise BuildError(f'{name}: cannot parse {label or "CSV"}: {e}') from e
+
+    missing = [c for c in spec['columns'] if c not in table.columns]
+    if missing:
+        raise BuildError(f'{name}: missing columns {missing}')
+    table = table.drop_duplicates().drop_duplicates(subset=spec['key'], keep='last')
+    if len(table) < spec['min_rows']:
+        raise BuildError(f'{name}: {len(table)} rows, expected at least {spec["min_rows"]}')
+
+    return table.reset_index(drop=True)
+
+
+def parse_geojson(raw, label=None):
+    try:
+        geojson = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise BuildError(f'monaco_geojson: cannot parse {label or "GeoJSON"}: {e}') from e
+    if not isinstance(geojson, dict) or 'type' not in geojson:
+        raise BuildError(f'monaco_geojson: {label or "input"} is not a GeoJSON object')
+    return simplify_geojson(geojson)
+
+
+def parse_fatalities(html):
+    """Extract the driver fatalities table from the Wikipedia page."""
+    import bs4
+
+    soup = bs4.BeautifulSoup(html, 'html.parser')
+    tables = soup.find_all('table')
+    if len(tables) < 3:
+        raise BuildError('fatalities: driver table not found')
+    rows = tables[2].find_all('tr')
+    if not rows:
+        raise BuildError('fatalities: driver table is empty')
+
+    headers = [th.get_text(strip=True) for th in rows[0].find_all('th')]
+    if 'Date of accident' not in headers:
+        raise BuildError(f'fatalities: unexpected headers {headers}')
+    data = []
+    for row in rows[1:]:
+        cells = row.find_all(['td', 'th'])
+        if len(cells) != len(headers):
+            continue
+        row_data = [cell.get_text(strip=True) for cell in cells]
+        data.append(row_data)
+
+    df = pd.DataFrame(data, columns=headers).drop_duplicates()
+    df['Date'] = pd.to_datetime(df['Date of accident'], errors='coerce')
+    df = df.dropna(subset=['Date'])
+    df['Year'] = df['Date'].dt.year.astype(int)
+    df['Decade'] = (df['Year'] // 10) * 10
+    if len(df) < FATALITIES_MIN_ROWS:
+        raise BuildError(f'fatalities: {len(df)} rows, expected at least {FATALITIES_MIN_ROWS}')
+
+    return df.reset_index(drop=True)
+
+
+def senna_results(results, drivers, races):
+    df = results.merge(drivers, on='driverId')
+    df = df.merge(races, on='raceId')
+    return df[(df['surname'] == 'Senna') & (df['forename'] == 'Ayrton')].reset_index(drop=True)
+
+
+def fatalities_per_decade(fatalities):
+    return fatalities.groupby('Decade').size().reset_index(name='Fatalities')
+
+
+def fatalities_pie(fatalities):
+    before_1994 = fatalities[fatalities['Year'] < 1994].shape[0]
+    after_1994 = fatalities[fatalities['Year'] >= 1994].shape[0]
+    return pd.DataFrame({
+        'Period': ['Before 1994', '1994 and After'],
+        'Fatalities': [before_1994, after_1994]
+    })
+
+
+def simplify_geojson(geojson, precision=5):
+    """Round coordinates (~1 m at 5 decimals) and drop repeated points."""
+    def simplify(coords):
+        if coords and isinstance(coords[0], (int, float)):
+            return [round(c, precision) for c in coords]
+        simplified = [simplify(c) for c in coords]
+        if simplified and simplified[0] and not isinstance(simplified[0][0], list):
+            simplified = [p for i, p in enumerate(simplified) if i == 0 or p != simplified[i - 1]]
+        return simplified
+
+    geojson = json.loads(json.dumps(geojson))
+    features = geojson['features'] if geojson.get('type') == 'FeatureCollection' else [geojson]
+    for feature in features:
+        geometry = feature.get('geometry') or {}
+        if 'coordinates' in geometry:
+            geometry['coordinates'] = simplify(geometry['coordinates'])
+    return geojson
+
+
+# --- Bundle ---
+def load_bundle(bundle_dir=BUNDLE_DIR):
+    """Load a bundle written by `Builder`, verifying it against its manifest."""
+    with open(os.path.join(bundle_dir, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get('version') != BUNDLE_VERSION:
+        raise BuildError(f'{bundle_dir}: bundle version {manifest.get("version")}, expected {BUNDLE_VERSION}')
+    missing = [name for name in ARTIFACTS if name not in manifest['artifacts']]
+    if not manifest.get('complete') or missing:
+        raise BuildError(f'{bundle_dir}: incomplete bundle (missing {missing or "final checks"}), '
+                         f're-run build_data.py to finish it')
+    figure_inputs = manifest['artifacts']['static_figures']['inputs']
+    stale = [k for k, v in _figure_inputs().items() if figure_inputs.get(k) != v]
+    if stale:
+        raise BuildError(f'{bundle_dir}: static figures were built with a different {" and ".join(stale)}, '
+                         f're-run build_data.py to rebuild them')
+
+    data = {}
+    for name, entry in manifest['artifacts'].items():
+        path = os.path.join(bundle_dir, entry['file'])
+        if file_sha256(path) != entry['sha256']:
+            raise BuildError(f'{path}: checksum mismatch, rebuild the bundle')
+        data[name] = _read_artifact(path)
+    missing = [graph_id for graph_id in figures.STATIC_FIGURES if graph_id not in data['static_figures']]
+    if missing:
+        raise BuildError(f'{bundle_dir}: static figures {missing} are missing, '
+                         f're-run build_data.py --force to rebuild them')
+    return data
+
+
+def _figure_inputs():
+    # static figures also depend on the figure code and the Plotly version that serialized them
+    with open(figures.__file__, 'rb') as f:
+        return {'figures.py': sha256(f.read()), 'plotly': plotly.__version__}
+
+
+def _read_artifact(path):
+    if path.endswith(('.json', '.geojson')):
+        with open(path) as f:
+            return json.load(f)
+    return pd.read_pickle(path)
+
+
+def load_sources(source='f1_data', geojson=None, fatalities_html=None, offline=False):
+    """Build every artifact in memory, without writing a bundle."""
+    data = {}
+    for name in TABLES:
+        label, raw = find_source(source, f'{name}.csv')
+        data[name] = read_table(name, raw, label)
+    label, raw = find_source(geojson or source, MONACO_GEOJSON)
+    data['monaco_geojson'] = parse_geojson(raw, label)
+    data['fatalities'] = parse_fatalities(_fatalities_source(fatalities_html, offline)[1])
+    data.update(_derive(data))
+    data['static_figures'] = figures.build_static_figures(data)
+    return data
+
+
+def _fatalities_source(fatalities_html, offline):
+    if fatalities_html:
+        try:
+            with open(fatalities_html, 'rb') as f:
+                return fatalities_html, f.read()
+        except OSError as e:
+            raise BuildError(f'fatalities: cannot read {fatalities_html}: {e}') from e
+    if offline:
+        raise BuildError('fatalities: --fatalities-html is required with --offline')
+    import requests
+
+    try:
+        req = requests.get(FATALITIES_URL, timeout=30)
+        req.raise_for_status()
+    except requests.RequestException as e:
+        raise BuildError(f'fatalities: cannot fetch {FATALITIES_URL}: {e}') from e
+    return FATALITIES_URL, req.content
+
+
+def _derive(data):
+    return {
+        'df_senna': senna_results(data['results'], data['drivers'], data['races']),
+        'fatalities_per_decade': fatalities_per_decade(data['fatalities']),
+        'pie_data': fatalities_pie(data['fatalities']),
+    }
+
+
+class Builder:
+    """Runs build steps against a bundle directory, recording a manifest.
+
+    Each artifact is stored with the checksums of the inputs it was built
+    from; an artifact is reused when both still match.
+    """
+
+    def __init__(self, out, jobs=None, force=False):
+        self.out = out
+        self.jobs = jobs
+        self.lock = threading.Lock()
+        self.manifest = {'version': BUNDLE_VERSION, 'complete': False, 'artifacts': {}}
+        manifest_path = os.path.join(out, MANIFEST)
+        if not force and os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == BUNDLE_VERSION:
+                self.manifest = manifest
+
+    def is_current(self, name, inputs):
+        entry = self.manifest['artifacts'].get(name)
+        if not entry or entry['inputs'] != inputs:
+            return False
+        path = os.path.join(self.out, entry['file'])
+        return os.path.exists(path) and file_sha256(path) == entry['sha256']
+
+    def load(self, name):
+        return _read_artifact(os.path.join(self.out, self.manifest['artifacts'][name]['file']))
+
+    def write(self, name, value, inputs):
+        if isinstance(value, pd.DataFrame):
+            filename, rows = f'{name}.pkl', len(value)
+        elif value.get('type') == 'FeatureCollection':
+            filename, rows = f'{name}.geojson', len(value['features'])
+        else:
+            filename, rows = f'{name}.json', len(value)
+        path = os.path.join(self.out, filename)
+        tmp = path + '.tmp'
+        if isinstance(value, pd.DataFrame):
+            value.to_pickle(tmp)
+        else:
+            with open(tmp, 'w') as f:
+                json.dump(value, f, separators=(',', ':'))
+        os.replace(tmp, path)
+
+        entry = {
+            'file': filename,
+            'sha256': file_sha256(path),
+            'rows': rows,
+            'inputs': inputs,
+        }
+        with self.lock:
+            self.manifest['artifacts'][name] = entry
+            self._save_manifest()
+
+    def _save_manifest(self):
+        path = os.path.join(self.out, MANIFEST)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(path + '.tmp', path)
+
+    def step(self, name, inputs, build):
+        """Return artifact `name`, building it only if it is out of date."""
+        if self.is_current(name, inputs):
+            print(f'  {name}: up to date')
+            return self.load(name)
+        value = build()
+        self.write(name, value, inputs)
+        print(f'  {name}: built ({self.manifest["artifacts"][name]["rows"]} rows)')
+        return value
+
+    def run(self, source, geojson=None, fatalities_html=None, offline=False):
+        os.makedirs(self.out, exist_ok=True)
+        # the manifest is saved after every step so a failed build can resume, but
+        # load_bundle() only accepts it once `complete` is set at the very end
+        with self.lock:
+            self.manifest['complete'] = False
+            self._save_manifest()
+
+        def ingest_table(name):
+            label, raw = find_source(source, f'{name}.csv')
+            return self.step(name, {label: sha256(raw)}, lambda: read_table(name, raw, label))
+
+        def ingest_geojson():
+            label, raw = find_source(geojson or source, MONACO_GEOJSON)
+            return self.step('monaco_geojson', {label: sha256(raw)}, lambda: parse_geojson(raw, label))
+
+        def ingest_fatalities():
+            if 'fatalities' in self.manifest['artifacts'] and not fatalities_html and offline:
+                # keep the previously fetched snapshot when rebuilding offline
+                entry = self.manifest['artifacts']['fatalities']
+                if self.is_current('fatalities', entry['inputs']):
+                    print('  fatalities: up to date')
+                    return self.load('fatalities')
+            label, raw = _fatalities_source(fatalities_html, offline)
+            return self.step('fatalities', {label: sha256(raw)}, lambda: parse_fatalities(raw))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = {name: pool.submit(ingest_table, name) for name in TABLES}
+            futures['monaco_geojson'] = pool.submit(ingest_geojson)
+            futures['fatalities'] = pool.submit(ingest_fatalities)
+            data = {name: future.result() for name, future in futures.items()}
+
+        # derived artifacts depend on the checksums of the artifacts they read
+        def artifact_inputs(*names):
+            return {n: self.manifest['artifacts'][n]['sha256'] for n in names}
+
+        derived = {
+            'df_senna': (('results', 'drivers', 'races'),
+                         lambda: senna_results(data['results'], data['drivers'], data['races'])),
+            'fatalities_per_decade': (('fatalities',), lambda: fatalities_per_decade(data['fatalities'])),
+            'pie_data': (('fatalities',), lambda: fatalities_pie(data['fatalities'])),
+        }
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = {name: pool.submit(self.step, name, artifact_inputs(*deps), build)
+                       for name, (deps, build) in derived.items()}
+            data.update({name: future.result() for name, future in futures.items()})
+
+        figure_sources = sorted({source for _, source in figures.STATIC_FIGURES.values()})
+        self.step('static_figures', {**artifact_inputs(*figure_sources), **_figure_inputs()},
+                  lambda: figures.build_static_figures(data))
+
+        with self.lock:
+            self.manifest['complete'] = all(name in self.manifest['artifacts'] for name in ARTIFACTS)
+            self._save_manifest()
+        return self.manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the prebuilt dashboard data bundle.')
+    parser.add_argument('--source', default='f1_data',
+                        help='directory or .zip containing the Kaggle CSVs (default: f1_data)')
+    parser.add_argument('--geojson', default=None,
+                        help=f'directory or .zip containing {MONACO_GEOJSON} (default: --source)')
+    parser.add_argument('--fatalities-html', default=None,
+                        help='saved copy of the Wikipedia fatalities page (default: fetch it)')
+    parser.add_argument('--offline', action='store_true',
+                        help='never access the network')
+    parser.add_argument('--out', default=BUNDLE_DIR, help=f'bundle directory (default: {BUNDLE_DIR})')
+    parser.add_argument('--jobs', type=int, default=None, help='parallel build steps')
+    parser.add_argument('--force', action='store_true', help='rebuild every artifact')
+    args = parser.parse_args(argv)
+
+    print(f'Building {args.out}')
+    try:
+        Builder(args.out, jobs=args.jobs, force=args.force).run(
+            args.source, geojson=args.geojson,
+            fatalities_html=args.fatalities_html, offline=args.offline)
+    except BuildError as e:
+        print(f'error: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
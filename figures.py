@@ -0,0 +1,196 @@
+"""Figures that depend only on the loaded data, never on user input.
+
+build_data.py prebuilds them into the bundle as Plotly JSON, so app.py
+only has to hand them out.
+"""
+import json
+
+import pandas as pd
+import plotly.express as px
+
+
+def race_outcomes_pie(df_senna):
+    # Categorize finishes
+    finishes = {
+        'Wins': (df_senna['positionOrder'] == 1).sum(),
+        '2nd/3rd (Podiums)': df_senna['positionOrder'].isin([2, 3]).sum(),
+        '4th–10th': df_senna['positionOrder'].between(4, 10).sum(),
+        'Other / DNF': df_senna['positionOrder'].gt(10).sum()
+    }
+
+    pie_df = pd.DataFrame({
+        'Result': list(finishes.keys()),
+        'Count': list(finishes.values())
+    })
+
+    # Generate figure
+    fig = px.pie(
+        pie_df,
+        values='Count',
+        names='Result',
+        hole=0.35,
+        color_discrete_sequence=['#a50026', '#d73027', '#f46d43', '#fdae61'],
+        template='plotly_white',
+    )
+
+    fig.update_traces(
+        textinfo='percent+label',
+        textfont_size=16,
+        marker=dict(line=dict(color='white', width=2)),
+        hovertemplate='%{label}<br>Count: %{value} (%{percent})<extra></extra>'
+    )
+
+    fig.update_layout(
+        showlegend=False,
+        margin=dict(t=20, b=20, l=20, r=20),
+    )
+
+    return fig
+
+
+def poles_by_track(df_senna):
+    poles_by_circuit = (
+        df_senna[df_senna['grid'] == 1]
+        .groupby('name')
+        .size()
+        .reset_index(name='Pole Positions')
+        .sort_values('Pole Positions', ascending=False)
+    )
+
+    poles_by_circuit['name'] = poles_by_circuit['name'].str.replace(r'\s*Grand Prix', '', regex=True)
+
+    # Generate bar chart
+    fig = px.bar(
+        poles_by_circuit,
+        x='name',
+        y='Pole Positions',
+        text='Pole Positions',
+        labels={'name': 'Track'},
+        color_discrete_sequence=['crimson'],
+        template='plotly_white'
+    )
+
+    # Enhance layout
+    fig.update_layout(
+        xaxis_title='Track',
+        yaxis_title='Number of Poles',
+        xaxis_tickfont_size=12,
+        xaxis_tickangle=-45,
+        font=dict(size=14),
+        plot_bgcolor='white',
+        margin=dict(l=20, r=20, t=5, b=40),
+    )
+
+    fig.update_yaxes(tick0=0)
+    fig.update_traces(textposition='outside', hovertemplate='Season: %{x}<br>Points: %{y:.1f}')
+
+    return fig
+
+
+def poles_vs_wins(df_senna):
+    poles = df_senna[df_senna['grid'] == 1].groupby('year').size().reset_index(name='poles')
+    wins = df_senna[df_senna['positionOrder'] == 1].groupby('year').size().reset_index(name='wins')
+    combined = pd.merge(poles, wins, on='year', how='outer').fillna(0)
+    combined = combined.sort_values('year')
+
+    fig = px.line(
+        combined,
+        x='year',
+        y=['poles', 'wins'],
+        markers=True,
+        labels={'value': 'Count', 'variable': 'Stat', 'year': 'Season'},
+        template='plotly_white',
+        color_discrete_map={'poles': 'crimson', 'wins': 'gold'}
+    )
+
+    fig.update_layout(
+        margin=dict(t=20, b=40, l=20, r=20),
+        legend=dict(title='', font=dict(size=14)),
+        xaxis=dict(
+            rangeslider=dict(visible=True),
+            type='linear',
+            tickmode='linear',
+            dtick=1,
+            title='Season',
+            showgrid=True
+        ),
+        yaxis=dict(
+            title='Count',
+            showgrid=True,
+            zeroline=True
+        )
+    )
+
+    fig.update_traces(marker=dict(size=8))
+
+    return fig
+
+
+def fatalities_line(fatalities_per_decade):
+    fig = px.line(
+        fatalities_per_decade,
+        x='Decade',
+        y='Fatalities',
+        markers=True,
+        labels={'Decade': 'Decade', 'Fatalities': 'Number of Fatalities'},
+        template='plotly_white'
+    )
+
+    fig.update_traces(
+        line=dict(color='crimson', width=3),
+        marker=dict(size=8, symbol='circle'),
+        text=fatalities_per_decade['Fatalities'],
+        textposition="top center",
+        hovertemplate='Decade: %{x}<br>Fatalities: %{y}<extra></extra>'
+    )
+
+    fig.update_layout(
+        font=dict(size=14),
+        margin=dict(l=20, r=20, t=20, b=20),
+        yaxis=dict(tick0=0, dtick=1, title='Number of Fatalities'),
+        xaxis=dict(title='Decade'),
+        plot_bgcolor='white',
+        showlegend=False
+    )
+
+    return fig
+
+
+def fatalities_pie(pie_data):
+    pie_fig = px.pie(
+        pie_data,
+        names='Period',
+        values='Fatalities',
+        hole=0.4,
+        color_discrete_sequence=["#1b72dd", '#d73027']
+    )
+
+    pie_fig.update_traces(
+        textinfo='percent+label',
+        hovertemplate='%{label}: %{value} fatalities (%{percent})<extra></extra>'
+    )
+
+    pie_fig.update_layout(
+        margin=dict(t=20, b=20, l=20, r=20),
+        font=dict(size=14),
+        showlegend=True,
+        legend=dict(font=dict(size=16)),
+    )
+
+    return pie_fig
+
+
+# Graph id -> (figure builder, data it is built from)
+STATIC_FIGURES = {
+    'senna-pie-chart': (race_outcomes_pie, 'df_senna'),
+    'poles-by-track': (poles_by_track, 'df_senna'),
+    'poles-vs-wins': (poles_vs_wins, 'df_senna'),
+    'fatalities-line': (fatalities_line, 'fatalities_per_decade'),
+    'fatalities-pie': (fatalities_pie, 'pie_data'),
+}
+
+
+def build_static_figures(data):
+    """Build every static figure as a plain JSON dict, keyed by graph id."""
+    return {graph_id: json.loads(build(data[source]).to_json())
+            for graph_id, (build, source) in STATIC_FIGURES.items()}
@@ -0,0 +1,415 @@
+"""Load test the dashboard with synthetic Dash sessions.
+
+Each simulated user loads the page the way the Dash renderer does
+(_dash-layout, _dash-dependencies, then every initial server callback),
+then drags the range sliders and changes the driver selector at random,
+firing the callbacks that depend on each change.
+
+    python loadtest.py --users 8 --sessions 100
+    python loadtest.py --url http://localhost:8050 --users 32 --duration 60
+
+Without --url the app is imported and driven in-process through the Flask
+test client. With --url any running server (dev server, gunicorn, an ASGI
+bridge, ...) can be measured, so worker models and caching modes can be
+compared on the same machine.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+INTERACTIVE_TYPES = ('RangeSlider', 'Slider', 'Dropdown')
+DRAG_INTERVAL = 0.01  # seconds between the values of a --burst drag
+
+
+# --- Clients ---
+class InProcessClient:
+    def __init__(self):
+        import app
+        self.client = app.app.server.test_client()
+
+    def get(self, path):
+        response = self.client.get(path)
+        return response.status_code, response.get_json(silent=True)
+
+    def post(self, path, payload):
+        response = self.client.post(path, json=payload)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpClient:
+    def __init__(self, url, timeout=30):
+        import requests
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def get(self, path):
+        response = self.session.get(self.url + path, timeout=self.timeout)
+        return response.status_code, _json_or_none(response)
+
+    def post(self, path, payload):
+        response = self.session.post(self.url + path, json=payload, timeout=self.timeout)
+        return response.status_code, _json_or_none(response)
+
+
+def _json_or_none(response):
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+# --- Stats ---
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+        self.error_samples = {}
+        self.no_updates = defaultdict(int)
+        self.sessions = 0
+
+    def record(self, name, seconds, error=None, detail=None, no_update=False):
+        """Record one request; `error` is a short kind such as 'HTTP 500' or 'ConnectionError'."""
+        with self.lock:
+            self.latencies[name].append(seconds)
+            if error:
+                self.errors[name][error] += 1
+                self.error_samples.setdefault(error, detail)
+            if no_update:
+                self.no_updates[name] += 1
+
+    def session_done(self):
+        with self.lock:
+            self.sessions += 1
+
+    def summary(self, elapsed):
+        rows = {}
+        for name, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            errors = sum(self.errors[name].values())
+            rows[name] = {
+                'requests': len(latencies),
+                'errors': errors,
+                'error_kinds': dict(self.errors[name]),
+                'error_rate': errors / len(latencies),
+                'no_update': self.no_updates[name],
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p90_ms': percentile(latencies, 90) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000,
+                'max_ms': latencies[-1] * 1000,
+            }
+        total = sum(r['requests'] for r in rows.values())
+        errors = sum(r['errors'] for r in rows.values())
+        return {
+            'elapsed_s': elapsed,
+            'sessions': self.sessions,
+            'requests': total,
+            'errors': errors,
+            'error_rate': errors / total if total else 0.0,
+            # first message seen for each kind of error, to show its cause
+            'error_samples': dict(self.error_samples),
+            'requests_per_s': total / elapsed if elapsed else 0.0,
+            'sessions_per_s': self.sessions / elapsed if elapsed else 0.0,
+            'endpoints': rows,
+        }
+
+
+def percentile(sorted_values, pct):
+    # nearest-rank percentile: the ceil(p/100 * n)-th smallest value
+    index = max(0, math.ceil(pct * len(sorted_values) / 100) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+# --- Dash session model ---
+def walk_layout(node, components):
+    """Collect {id: component} for every component with an id in the layout tree."""
+    if isinstance(node, list):
+        for child in node:
+            walk_layout(child, components)
+    elif isinstance(node, dict) and 'props' in node and 'type' in node:
+        props = node['props']
+        if isinstance(props.get('id'), str):
+            components[props['id']] = node
+        for value in props.values():
+            walk_layout(value, components)
+
+
+def split_output(output):
+    """Turn a dependency's output string into the `outputs` request field."""
+    if output.startswith('..'):
+        return [dict(zip(('id', 'property'), o.rsplit('.', 1)))
+                for o in output.strip('.').split('...')]
+    component_id, prop = output.rsplit('.', 1)
+    return {'id': component_id, 'property': prop}
+
+
+# Python stand-ins for the app's clientside callbacks (assets/clientside.js). Simulated users
+# change a value only once it has settled, so the debounce itself is not emulated.
+def stamp_sequence(session, value, slider_id):
+    session.counters[slider_id] += 1
+    return {
+        'session': session.session_id,
+        'seq': session.counters[slider_id],
+        'value': value,
+    }
+
+
+CLIENTSIDE_FUNCTIONS = {
+    ('senna', 'stampSequence'): stamp_sequence,
+}
+
+
+def prop_id(dependency):
+    return f"{dependency['id']}.{dependency['property']}"
+
+
+class Session:
+    """One simulated browser tab."""
+
+    def __init__(self, client, stats, rng, think_time=0.0, burst=1):
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.think_time = think_time
+        self.burst = burst
+        self.in_flight = None
+        self.session_id = f'{rng.getrandbits(64):016x}'
+        self.counters = defaultdict(int)
+        self.state = {}
+        self.components = {}
+        self.callbacks = []
+
+    def timed(self, name, request, *args):
+        start = time.perf_counter()
+        error = detail = None
+        try:
+            status, body = request(*args)
+        except Exception as e:
+            status, body = None, None
+            error, detail = type(e).__name__, str(e)
+        if error is None and status not in (200, 204):
+            error, detail = f'HTTP {status}', f'{name} returned {status}'
+        # no_update comes back as 204 (PreventUpdate) or, on newer Dash, an empty response
+        no_update = status == 204 or (status == 200 and isinstance(body, dict) and body.get('response') == {})
+        self.stats.record(name, time.perf_counter() - start, error=error, detail=detail, no_update=no_update)
+        return body if status == 200 else None
+
+    def load(self):
+        layout = self.timed('_dash-layout', self.client.get, '/_dash-layout')
+        dependencies = self.timed('_dash-dependencies', self.client.get, '/_dash-dependencies')
+        if layout is None or dependencies is None:
+            return False
+
+        walk_layout(layout, self.components)
+        for component_id, component in self.components.items():
+            for prop, value in component['props'].items():
+                self.state[(component_id, prop)] = value
+        self.callbacks = dependencies
+
+        # the renderer fires every callback whose inputs are all in the layout; callbacks
+        # fed by another callback's output wait for it and fire through propagate()
+        outputs = {prop_id(o) for cb in self.callbacks for o in self.outputs(cb)}
+        for callback in self.callbacks:
+            inputs = [prop_id(i) for i in callback['inputs']]
+            if all(i['id'] in self.components for i in callback['inputs']) and not outputs.intersection(inputs):
+                self.fire(callback, inputs)
+        return True
+
+    def outputs(self, callback):
+        outputs = split_output(callback['output'])
+        return outputs if isinstance(outputs, list) else [outputs]
+
+    def fire(self, callback, changed):
+        if callback.get('clientside_function'):
+            updated = self.fire_clientside(callback)
+        else:
+            updated = self.fire_server(callback, changed)
+        for changed_prop in updated:
+            self.propagate(changed_prop)
+
+    def fire_clientside(self, callback):
+        function = callback['clientside_function']
+        emulate = CLIENTSIDE_FUNCTIONS.get((function['namespace'], function['function_name']))
+        if emulate is None:
+            return []
+        args = [self.state.get((d['id'], d['property'])) for d in callback['inputs'] + callback.get('state', [])]
+        output = self.outputs(callback)[0]
+        self.state[(output['id'], output['property'])] = emulate(self, *args)
+        return [prop_id(output)]
+
+    def fire_server(self, callback, changed):
+        payload = {
+            'output': callback['output'],
+            'outputs': split_output(callback['output']),
+            'inputs': [dict(i, value=self.state.get((i['id'], i['property']))) for i in callback['inputs']],
+            'changedPropIds': changed,
+            'state': [dict(s, value=self.state.get((s['id'], s['property']))) for s in callback.get('state', [])],
+        }
+        if self.in_flight is not None:
+            # mid-drag: send without waiting for the response, like the browser does
+            thread = threading.Thread(target=self.timed, args=(
+                callback['output'], self.client.post, '/_dash-update-component', payload))
+            thread.start()
+            self.in_flight.append(thread)
+            return []
+
+        body = self.timed(callback['output'], self.client.post, '/_dash-update-component', payload)
+        updated = []
+        for component_id, props in ((body or {}).get('response') or {}).items():
+            for prop, value in props.items():
+                self.state[(component_id, prop)] = value
+                updated.append(f'{component_id}.{prop}')
+        return updated
+
+    def propagate(self, changed):
+        for callback in self.callbacks:
+            if changed in [prop_id(i) for i in callback['inputs']]:
+                self.fire(callback, [changed])
+
+    def interactive(self):
+        """Components that feed some callback and can be driven by a user."""
+        input_ids = {i['id'] for cb in self.callbacks for i in cb['inputs']}
+        return [c for cid, c in self.components.items()
+                if cid in input_ids and c['type'] in INTERACTIVE_TYPES]
+
+    def interact(self, component):
+        props = component['props']
+        if component['type'] == 'Dropdown':
+            options = [o['value'] if isinstance(o, dict) else o for o in props.get('options', [])]
+            value = self.rng.sample(options, self.rng.randint(1, len(options))) if props.get('multi') \
+                else self.rng.choice(options)
+        elif component['type'] == 'RangeSlider':
+            step = props.get('step') or 1
+            points = range(int(props['min']), int(props['max']) + 1, int(step))
+            value = sorted(self.rng.sample(points, 2))
+            if self.burst > 1:
+                return self.drag(props['id'], value)
+        else:
+            step = props.get('step') or 1
+            value = self.rng.choice(range(int(props['min']), int(props['max']) + 1, int(step)))
+
+        self.state[(props['id'], 'value')] = value
+        self.propagate(f"{props['id']}.value")
+
+    def drag(self, component_id, target):
+        """Move a RangeSlider to `target` through `burst` intermediate values sent back to back."""
+        start = self.state.get((component_id, 'value')) or target
+        self.in_flight = []
+        try:
+            for i in range(1, self.burst + 1):
+                value = [round(a + (b - a) * i / self.burst) for a, b in zip(start, target)]
+                self.state[(component_id, 'value')] = value
+                self.propagate(f'{component_id}.value')
+                time.sleep(DRAG_INTERVAL)
+        finally:
+            threads, self.in_flight = self.in_flight, None
+            for thread in threads:
+                thread.join()
+
+    def run(self, interactions):
+        if not self.load():
+            return
+        components = self.interactive()
+        for _ in range(interactions if components else 0):
+            if self.think_time:
+                time.sleep(self.rng.uniform(0, self.think_time))
+            self.interact(self.rng.choice(components))
+        self.stats.session_done()
+
+
+def run(client_factory, users, sessions=None, duration=None, interactions=10, think_time=0.0, burst=1,
+        seed=None):
+    stats = Stats()
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + duration if duration else None
+    remaining = [sessions]
+    lock = threading.Lock()
+
+    def next_session():
+        with lock:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            if remaining[0] is not None:
+                if remaining[0] <= 0:
+                    return False
+                remaining[0] -= 1
+            return True
+
+    def user(user_seed):
+        client = client_factory()
+        user_rng = random.Random(user_seed)
+        while next_session():
+            Session(client, stats, user_rng, think_time, burst).run(interactions)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        for future in [pool.submit(user, rng.random()) for _ in range(users)]:
+            future.result()
+    return stats.summary(time.perf_counter() - start)
+
+
+def print_report(summary):
+    print(f"{summary['sessions']} sessions, {summary['requests']} requests in {summary['elapsed_s']:.1f}s "
+          f"({summary['requests_per_s']:.1f} req/s, {summary['sessions_per_s']:.2f} sessions/s), "
+          f"error rate {summary['error_rate']:.2%}")
+    print()
+    width = max(len(name) for name in summary['endpoints']) if summary['endpoints'] else 10
+    print(f"{'endpoint':<{width}}  {'count':>6}  {'err%':>6}  {'skipped':>7}  {'p50 ms':>8}  {'p90 ms':>8}  {'p99 ms':>8}  {'max ms':>8}")
+    for name, row in summary['endpoints'].items():
+        print(f"{name:<{width}}  {row['requests']:>6}  {row['error_rate']:>6.1%}  {row['no_update']:>7}  {row['p50_ms']:>8.1f}  "
+              f"{row['p90_ms']:>8.1f}  {row['p99_ms']:>8.1f}  {row['max_ms']:>8.1f}")
+
+    if summary['errors']:
+        print()
+        print('errors:')
+        for name, row in summary['endpoints'].items():
+            for kind, count in sorted(row['error_kinds'].items()):
+                print(f"  {name:<{width}}  {kind}: {count}")
+        for kind, detail in sorted(summary['error_samples'].items()):
+            print(f"  {kind} e.g. {detail[:200]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay synthetic Dash sessions against the dashboard.')
+    parser.add_argument('--url', default=None,
+                        help='server to test, e.g. http://localhost:8050 (default: in-process test client)')
+    parser.add_argument('--users', type=int, default=4, help='concurrent simulated users')
+    parser.add_argument('--sessions', type=int, default=None, help='total sessions to run (default: 20 without --duration)')
+    parser.add_argument('--duration', type=float, default=None, help='run for this many seconds')
+    parser.add_argument('--interactions', type=int, default=10, help='slider/selector changes per session')
+    parser.add_argument('--think-time', type=float, default=0.0, help='max random pause between interactions (s)')
+    parser.add_argument('--burst', type=int, default=1,
+                        help='send each range slider change as this many values back to back, '
+                             'like a drag without the client-side debounce (default: 1)')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for reproducible sessions')
+    parser.add_argument('--json', default=None, help='also write the summary to this file')
+    args = parser.parse_args(argv)
+
+    if args.sessions is None and args.duration is None:
+        args.sessions = 20
+
+    if args.url:
+        client_factory = lambda: HttpClient(args.url)
+    else:
+        InProcessClient()  # import the app once, outside the timed run
+        client_factory = InProcessClient
+
+    summary = run(client_factory, args.users, sessions=args.sessions, duration=args.duration,
+                  interactions=args.interactions, think_time=args.think_time, burst=args.burst,
+                  seed=args.seed)
+    print_report(summary)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary['requests'] == 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
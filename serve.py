@@ -0,0 +1,89 @@
+"""Production server for the dashboard.
+
+Runs app.server under gunicorn with several worker processes. By default
+the app is imported, loading its data and static figures, in the master
+before forking, so workers share that memory copy-on-write.
+
+    python serve.py                              # one worker per core, 4 threads each
+    python serve.py --workers 8 --threads 2 --bind 0.0.0.0:8050
+    python serve.py --asgi                       # uvicorn workers via an ASGI bridge
+
+GET /healthz answers 200 from any worker that is up: a worker only starts once
+its data and static figures have loaded.
+Build the data bundle first (python build_data.py) so boot does no parsing
+or fetching.
+"""
+import argparse
+import gc
+import multiprocessing
+import os
+import sys
+
+
+def make_application(options, asgi=False, threads=1):
+    from gunicorn.app.base import BaseApplication
+
+    class DashApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            import app
+
+            if self.cfg.preload_app:
+                # keep the loaded data out of the collector so workers don't touch (and copy) its pages
+                gc.freeze()
+            if asgi:
+                from a2wsgi import WSGIMiddleware
+                return WSGIMiddleware(app.server, workers=threads)
+            return app.server
+
+    return DashApplication()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the dashboard with multiple worker processes.')
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:8050'),
+                        help='address to listen on (default: 0.0.0.0:8050, or $BIND)')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', 0)) or multiprocessing.cpu_count(),
+                        help='worker processes (default: one per core, or $WEB_CONCURRENCY)')
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('THREADS', 4)),
+                        help='request threads per worker (default: 4, or $THREADS)')
+    parser.add_argument('--timeout', type=int, default=60, help='worker timeout in seconds')
+    parser.add_argument('--asgi', action='store_true',
+                        help='serve through an ASGI bridge on uvicorn workers (needs uvicorn and a2wsgi)')
+    parser.add_argument('--no-preload', action='store_true',
+                        help='load the data in each worker instead of once before forking '
+                             '(workers then no longer share slider sequence state)')
+    args = parser.parse_args(argv)
+
+    try:
+        import gunicorn  # noqa: F401
+        if args.asgi:
+            import a2wsgi  # noqa: F401
+            import uvicorn  # noqa: F401
+    except ImportError as e:
+        print(f'error: {e.name} is required: pip install gunicorn{" uvicorn a2wsgi" if args.asgi else ""}',
+              file=sys.stderr)
+        return 1
+
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'timeout': args.timeout,
+        'preload_app': not args.no_preload,
+    }
+    if args.asgi:
+        # the bridge runs the Flask app in its own pool of `threads` threads per worker
+        options['worker_class'] = 'uvicorn.workers.UvicornWorker'
+    else:
+        options['threads'] = args.threads
+        options['worker_class'] = 'gthread' if args.threads > 1 else 'sync'
+
+    make_application(options, asgi=args.asgi, threads=args.threads).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
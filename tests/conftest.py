@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_data  # noqa: E402
+
+# Stand-in for the Wikipedia fatalities page, so the tests never touch the network
+FATALITIES_HTML = (
+    '<html><table></table><table></table><table>'
+    '<tr><th>Driver</th><th>Date of accident</th><th>Circuit</th></tr>'
+    + ''.join(f'<tr><td>Driver {i}</td><td>{1950 + i}-05-01</td><td>Circuit</td></tr>' for i in range(60))
+    + '</table></html>'
+)
+
+
+F1_DATA = os.path.join(ROOT, 'f1_data')
+
+
+@pytest.fixture(scope='session')
+def fatalities_html(tmp_path_factory):
+    path = tmp_path_factory.mktemp('fatalities') / 'fatalities.html'
+    path.write_text(FATALITIES_HTML)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def dash_app(tmp_path_factory, fatalities_html):
+    """The app module, loaded from a bundle built from f1_data/."""
+    bundle = str(tmp_path_factory.mktemp('bundle') / 'bundle')
+    build_data.Builder(bundle).run(F1_DATA, fatalities_html=fatalities_html, offline=True)
+
+    build_data.BUNDLE_DIR = bundle
+    import app
+    return app
@@ -0,0 +1,133 @@
+import json
+import os
+import shutil
+import zipfile
+
+import pytest
+
+import build_data
+from conftest import F1_DATA
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A writable copy of the f1_data/ inputs, without any built bundle."""
+    path = tmp_path / 'f1_data'
+    shutil.copytree(F1_DATA, path, ignore=shutil.ignore_patterns('bundle'))
+    return path
+
+
+def build(out, source, capsys, **kwargs):
+    """Run a build and return {artifact: 'built' | 'up to date'} from its progress lines."""
+    capsys.readouterr()
+    manifest = build_data.Builder(str(out)).run(str(source), offline=True, **kwargs)
+    steps = dict(line.strip().split(': ', 1) for line in capsys.readouterr().out.splitlines())
+    return manifest, {name: status.split(' (')[0] for name, status in steps.items()}
+
+
+def test_read_table_rejects_missing_columns():
+    with pytest.raises(build_data.BuildError, match=r"circuits: missing columns \['name'\]"):
+        build_data.read_table('circuits', b'circuitId,circuitRef\n1,albert_park\n')
+
+
+def test_read_table_rejects_too_few_rows():
+    raw = b'circuitId,name\n' + b''.join(b'%d,Circuit %d\n' % (i, i) for i in range(10))
+    with pytest.raises(build_data.BuildError, match='circuits: 10 rows, expected at least 70'):
+        build_data.read_table('circuits', raw)
+
+
+def test_read_table_dedupes_on_primary_key():
+    with open(os.path.join(F1_DATA, 'circuits.csv'), 'rb') as f:
+        raw = f.read()
+    first = raw.splitlines()[1]
+    renamed = first.replace(b'Albert Park Grand Prix Circuit', b'Albert Park')
+
+    table = build_data.read_table('circuits', raw + first + b'\n' + renamed + b'\n')
+
+    assert len(table) == len(build_data.read_table('circuits', raw))
+    assert table['circuitId'].is_unique
+    # the last row for a key wins
+    assert table.loc[table['circuitId'] == 1, 'name'].item() == 'Albert Park'
+
+
+def test_find_source_in_zip_subfolder(tmp_path):
+    archive = tmp_path / 'f1-circuits-master.zip'
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('f1-circuits-master/README.md', 'circuits')
+        zf.writestr('f1-circuits-master/circuits/mc-1929.geojson', '{"type": "FeatureCollection"}')
+
+    label, raw = build_data.find_source(str(archive), 'mc-1929.geojson')
+
+    assert label == f'{archive}:f1-circuits-master/circuits/mc-1929.geojson'
+    assert raw == b'{"type": "FeatureCollection"}'
+
+
+def test_find_source_in_nested_mirror(tmp_path):
+    nested = tmp_path / 'mirror' / 'kaggle' / 'csv'
+    nested.mkdir(parents=True)
+    (nested / 'drivers.csv').write_bytes(b'driverId,forename,surname\n')
+
+    label, raw = build_data.find_source(str(tmp_path / 'mirror'), 'drivers.csv')
+
+    assert label == str(nested / 'drivers.csv')
+    assert raw == b'driverId,forename,surname\n'
+
+
+def test_find_source_reports_missing_file(tmp_path):
+    with pytest.raises(build_data.BuildError, match='drivers.csv not found'):
+        build_data.find_source(str(tmp_path), 'drivers.csv')
+
+
+def test_second_run_is_up_to_date(tmp_path, source, fatalities_html, capsys):
+    out = tmp_path / 'bundle'
+    _, first = build(out, source, capsys, fatalities_html=fatalities_html)
+    _, second = build(out, source, capsys, fatalities_html=fatalities_html)
+
+    assert set(first) == set(second) == set(build_data.ARTIFACTS)
+    assert set(first.values()) == {'built'}
+    assert set(second.values()) == {'up to date'}
+
+
+def test_changed_input_is_rebuilt(tmp_path, source, fatalities_html, capsys):
+    out = tmp_path / 'bundle'
+    build(out, source, capsys, fatalities_html=fatalities_html)
+    drivers = source / 'drivers.csv'
+    drivers.write_bytes(drivers.read_bytes().replace(b'"Bruno","Senna"', b'"Bruno","Senna Lalli"'))
+
+    _, steps = build(out, source, capsys, fatalities_html=fatalities_html)
+
+    rebuilt = {name for name, status in steps.items() if status == 'built'}
+    # only the changed table and what was derived from it
+    assert rebuilt == {'drivers', 'df_senna', 'static_figures'}
+
+
+def test_bundle_is_complete_only_after_a_full_build(tmp_path, source, fatalities_html, capsys):
+    out = tmp_path / 'bundle'
+    # offline without a fatalities page fails after the other tables were written
+    with pytest.raises(build_data.BuildError, match='--fatalities-html is required'):
+        build(out, source, capsys)
+    with open(out / build_data.MANIFEST) as f:
+        assert json.load(f)['complete'] is False
+    with pytest.raises(build_data.BuildError, match='incomplete bundle'):
+        build_data.load_bundle(str(out))
+
+    manifest, steps = build(out, source, capsys, fatalities_html=fatalities_html)
+
+    assert manifest['complete'] is True
+    assert steps['races'] == 'up to date'
+    assert set(build_data.load_bundle(str(out))) == set(build_data.ARTIFACTS)
+
+
+def test_bundle_missing_a_static_figure_is_rejected(tmp_path, source, fatalities_html, capsys):
+    out = tmp_path / 'bundle'
+    manifest, _ = build(out, source, capsys, fatalities_html=fatalities_html)
+    # a bundle whose figures file lost a graph, with a manifest that agrees with it
+    path = out / manifest['artifacts']['static_figures']['file']
+    static_figures = json.loads(path.read_text())
+    del static_figures['fatalities-pie']
+    path.write_text(json.dumps(static_figures))
+    manifest['artifacts']['static_figures']['sha256'] = build_data.file_sha256(str(path))
+    (out / build_data.MANIFEST).write_text(json.dumps(manifest))
+
+    with pytest.raises(build_data.BuildError, match=r"static figures \['fatalities-pie'\] are missing"):
+        build_data.load_bundle(str(out))
@@ -0,0 +1,6 @@
+def test_healthz_ok_after_import(dash_app):
+    # no explicit warm-up: importing the app is enough, e.g. under `gunicorn app:server`
+    response = dash_app.server.test_client().get('/healthz')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'ok', 'data': 'bundle'}
@@ -0,0 +1,20 @@
+import pytest
+
+import loadtest
+
+
+@pytest.mark.parametrize('pct, expected', [(50, 5), (90, 9), (99, 10), (100, 10), (0, 1)])
+def test_percentile_is_nearest_rank(pct, expected):
+    assert loadtest.percentile(list(range(1, 11)), pct) == expected
+
+
+def test_in_process_smoke(dash_app):
+    summary = loadtest.run(loadtest.InProcessClient, users=1, sessions=1, seed=0)
+
+    assert summary['sessions'] == 1
+    assert summary['errors'] == 0, summary['error_samples']
+    dependencies = dash_app.server.test_client().get('/_dash-dependencies').get_json()
+    server_outputs = {cb['output'] for cb in dependencies if not cb.get('clientside_function')}
+    assert server_outputs
+    # every server callback ran at least once, on load or through the slider stamps
+    assert server_outputs <= set(summary['endpoints'])
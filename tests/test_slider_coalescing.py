@@ -0,0 +1,79 @@
+import multiprocessing
+import uuid
+
+import pytest
+
+
+def slider_request(client, session, seq, value=(1985, 1990)):
+    return stamp_request(client, {'session': session, 'seq': seq, 'value': list(value)})
+
+
+def stamp_request(client, stamp):
+    response = client.post('/_dash-update-component', json={
+        'output': 'wins-season-bar.figure',
+        'outputs': {'id': 'wins-season-bar', 'property': 'figure'},
+        'inputs': [{
+            'id': 'season-range-slider-seq',
+            'property': 'data',
+            'value': stamp,
+        }],
+        'changedPropIds': ['season-range-slider-seq.data'],
+        'state': [],
+    })
+    assert response.status_code == 200
+    return response.get_json()['response']
+
+
+def test_late_stale_request_returns_no_update(dash_app):
+    client = dash_app.server.test_client()
+    session = uuid.uuid4().hex
+
+    assert 'wins-season-bar' in slider_request(client, session, 2)
+    assert slider_request(client, session, 1) == {}
+
+
+def test_other_tabs_are_not_superseded(dash_app):
+    client = dash_app.server.test_client()
+
+    assert 'wins-season-bar' in slider_request(client, uuid.uuid4().hex, 5)
+    assert 'wins-season-bar' in slider_request(client, uuid.uuid4().hex, 1)
+
+
+@pytest.mark.parametrize('stamp', [
+    'stamp',
+    {'seq': 1, 'value': [1985, 1990]},
+    {'session': 'tab', 'seq': '1', 'value': [1985, 1990]},
+    {'session': 'tab', 'seq': 1.5, 'value': [1985, 1990]},
+    {'session': 'tab', 'seq': True, 'value': [1985, 1990]},
+    {'session': 'tab', 'seq': -1, 'value': [1985, 1990]},
+    {'session': 'tab', 'seq': 2 ** 64, 'value': [1985, 1990]},
+    {'session': 'tab', 'seq': 1, 'value': 1985},
+    {'session': 'tab', 'seq': 1, 'value': [1985, 1990, 1995]},
+    {'session': 'tab', 'seq': 1, 'value': ['1985', '1990']},
+])
+def test_malformed_stamp_returns_no_update(dash_app, stamp):
+    assert stamp_request(dash_app.server.test_client(), stamp) == {}
+
+
+def test_malformed_stamp_leaves_sequence_table_alone(dash_app):
+    client = dash_app.server.test_client()
+    session = uuid.uuid4().hex
+
+    stamp_request(client, {'session': session, 'seq': 2 ** 63, 'value': [1985, 1990]})
+
+    assert 'wins-season-bar' in slider_request(client, session, 1)
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='needs fork')
+def test_sequence_state_is_shared_with_forked_workers(dash_app):
+    stamp = {'session': uuid.uuid4().hex, 'seq': 5, 'value': [1985, 1990]}
+
+    # a newer request handled by another (forked) worker process...
+    worker = multiprocessing.get_context('fork').Process(
+        target=dash_app.is_superseded, args=('season-range-slider', stamp))
+    worker.start()
+    worker.join()
+    assert worker.exitcode == 0
+
+    # ...makes an older one from the same tab stale here
+    assert dash_app.is_superseded('season-range-slider', dict(stamp, seq=3))